@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import atexit
+import itertools
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if os.getenv("EXCEL_FILLER_DATA_DIR"):
@@ -18,97 +22,156 @@ DB_PATH = DATA_DIR / "app.db"
 DATABASE_URL = os.getenv("DATABASE_URL")
 USE_POSTGRES = bool(DATABASE_URL)
 
+# Each thread keeps its own long-lived SQLite handle, so readers never see
+# another thread's open write transaction and WAL can serve them the last
+# committed snapshot. Handles run in autocommit mode; writers serialize on
+# _WRITE_LOCK and open BEGIN IMMEDIATE transactions via _sqlite_write().
+_LOCAL = threading.local()
+_WRITE_LOCK = threading.Lock()
+
+# Postgres connections come from a process-wide psycopg_pool.ConnectionPool.
+_PG_POOL = None
+_PG_POOL_LOCK = threading.Lock()
+
+# Rows per multi-row INSERT in upsert_answers. 4 binds per row (plus the one
+# shared timestamp) keeps a batch under SQLite's historical 999-variable limit.
+ANSWER_BATCH_SIZE = 200
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS cases (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'draft',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS case_answers (
+    case_id TEXT NOT NULL,
+    field_id TEXT NOT NULL,
+    answer_raw TEXT,
+    answer_norm TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY(case_id, field_id),
+    FOREIGN KEY(case_id) REFERENCES cases(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS exports (
+    id TEXT PRIMARY KEY,
+    case_id TEXT NOT NULL,
+    zip_path TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY(case_id) REFERENCES cases(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_cases_updated_at ON cases(updated_at);
+CREATE INDEX IF NOT EXISTS idx_case_answers_case_id ON case_answers(case_id);
+CREATE INDEX IF NOT EXISTS idx_exports_case_id ON exports(case_id);
+"""
+
 
 def utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def _connect_sqlite() -> sqlite3.Connection:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA busy_timeout = 5000")
     return conn
 
 
-def _connect_postgres():
-    import psycopg
-    from psycopg.rows import dict_row
+def _get_conn() -> sqlite3.Connection:
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None:
+        conn = _connect_sqlite()
+        _LOCAL.conn = conn
+        atexit.register(conn.close)
+    return conn
 
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
 
+@contextmanager
+def _sqlite_write() -> Iterator[sqlite3.Connection]:
+    conn = _get_conn()
+    with _WRITE_LOCK:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+
+def _pg_pool():
+    global _PG_POOL
+    if _PG_POOL is None:
+        with _PG_POOL_LOCK:
+            if _PG_POOL is None:
+                from psycopg.rows import dict_row
+                from psycopg_pool import ConnectionPool
+
+                _PG_POOL = ConnectionPool(
+                    DATABASE_URL,
+                    min_size=2,
+                    max_size=10,
+                    kwargs={"row_factory": dict_row},
+                    open=True,
+                )
+                atexit.register(_PG_POOL.close)
+    return _PG_POOL
 
-def init_db() -> None:
-    schema_sql = """
-    CREATE TABLE IF NOT EXISTS cases (
-        id TEXT PRIMARY KEY,
-        title TEXT NOT NULL,
-        status TEXT NOT NULL DEFAULT 'draft',
-        created_at TEXT NOT NULL,
-        updated_at TEXT NOT NULL
-    );
-
-    CREATE TABLE IF NOT EXISTS case_answers (
-        case_id TEXT NOT NULL,
-        field_id TEXT NOT NULL,
-        answer_raw TEXT,
-        answer_norm TEXT,
-        updated_at TEXT NOT NULL,
-        PRIMARY KEY(case_id, field_id),
-        FOREIGN KEY(case_id) REFERENCES cases(id) ON DELETE CASCADE
-    );
-
-    CREATE TABLE IF NOT EXISTS exports (
-        id TEXT PRIMARY KEY,
-        case_id TEXT NOT NULL,
-        zip_path TEXT NOT NULL,
-        checksum TEXT NOT NULL,
-        created_at TEXT NOT NULL,
-        FOREIGN KEY(case_id) REFERENCES cases(id) ON DELETE CASCADE
-    );
-
-    CREATE INDEX IF NOT EXISTS idx_cases_updated_at ON cases(updated_at);
-    CREATE INDEX IF NOT EXISTS idx_case_answers_case_id ON case_answers(case_id);
-    CREATE INDEX IF NOT EXISTS idx_exports_case_id ON exports(case_id);
-    """
 
-    if USE_POSTGRES:
-        conn = _connect_postgres()
-    else:
-        conn = _connect_sqlite()
+def _init_sqlite(conn: sqlite3.Connection) -> None:
+    # journal_mode is stored in the database file, so setting it once here
+    # covers every later connection.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(f"BEGIN;\n{SCHEMA_SQL}\nCOMMIT;")
 
-    try:
+
+def _init_postgres(conn) -> None:
+    statements = [stmt.strip() for stmt in SCHEMA_SQL.split(";") if stmt.strip()]
+    with conn.transaction():
         with conn.cursor() as cur:
-            cur.execute(schema_sql)
-        conn.commit()
-    finally:
-        conn.close()
+            for statement in statements:
+                cur.execute(statement)
+
+
+def init_db() -> None:
+    if USE_POSTGRES:
+        with _pg_pool().connection() as conn:
+            _init_postgres(conn)
+        return
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with _WRITE_LOCK:
+        _init_sqlite(_get_conn())
 
 
 def create_case(case_id: str, title: str) -> Dict[str, str]:
     now = utc_now()
 
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
+        with _pg_pool().connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "INSERT INTO cases (id, title, status, created_at, updated_at) VALUES (%s, %s, 'draft', %s, %s)",
                     (case_id, title, now, now),
                 )
             conn.commit()
-        finally:
-            conn.close()
     else:
-        conn = _connect_sqlite()
-        try:
+        with _sqlite_write() as conn:
             conn.execute(
                 "INSERT INTO cases (id, title, status, created_at, updated_at) VALUES (?, ?, 'draft', ?, ?)",
                 (case_id, title, now, now),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     return {
         "id": case_id,
@@ -121,132 +184,156 @@ def create_case(case_id: str, title: str) -> Dict[str, str]:
 
 def get_case(case_id: str) -> Optional[Dict[str, str]]:
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
+        with _pg_pool().connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT * FROM cases WHERE id = %s", (case_id,))
                 row = cur.fetchone()
             if not row:
                 return None
             return dict(row)
-        finally:
-            conn.close()
 
-    conn = _connect_sqlite()
-    try:
-        cur = conn.execute("SELECT * FROM cases WHERE id = ?", (case_id,))
-        row = cur.fetchone()
-        if not row:
-            return None
-        return dict(row)
-    finally:
-        conn.close()
+    conn = _get_conn()
+    cur = conn.execute("SELECT * FROM cases WHERE id = ?", (case_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return dict(row)
 
 
 def list_cases(limit: int = 50) -> List[Dict[str, str]]:
     limit = max(1, min(limit, 200))
 
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
+        with _pg_pool().connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT * FROM cases ORDER BY updated_at DESC LIMIT %s", (limit,))
                 rows = cur.fetchall()
             return [dict(r) for r in rows]
-        finally:
-            conn.close()
 
-    conn = _connect_sqlite()
-    try:
-        cur = conn.execute("SELECT * FROM cases ORDER BY updated_at DESC LIMIT ?", (limit,))
-        return [dict(r) for r in cur.fetchall()]
-    finally:
-        conn.close()
+    conn = _get_conn()
+    cur = conn.execute("SELECT * FROM cases ORDER BY updated_at DESC LIMIT ?", (limit,))
+    return [dict(r) for r in cur.fetchall()]
+
+
+def _answer_upsert_sql(placeholder: str, row_count: int) -> str:
+    # The timestamp is bound once per statement (first parameter) and shared
+    # by every row; VALUES exposes its columns as column1..column4.
+    row_sql = "(" + ", ".join([placeholder] * 4) + ")"
+    values_sql = ", ".join([row_sql] * row_count)
+    return f"""
+    INSERT INTO case_answers (case_id, field_id, answer_raw, answer_norm, updated_at)
+    SELECT column1, column2, column3, column4, {placeholder}
+    FROM (VALUES {values_sql}) AS answer_rows
+    WHERE true
+    ON CONFLICT(case_id, field_id)
+    DO UPDATE SET
+        answer_raw = excluded.answer_raw,
+        answer_norm = excluded.answer_norm,
+        updated_at = excluded.updated_at
+    """
+
+
+def _answer_batches(rows: List[tuple]) -> Iterator[List[tuple]]:
+    for start in range(0, len(rows), ANSWER_BATCH_SIZE):
+        yield rows[start : start + ANSWER_BATCH_SIZE]
 
 
 def upsert_answers(case_id: str, normalized_answers: Dict[str, Dict[str, str]]) -> int:
+    payloads = normalized_answers.values()
+    return upsert_answers_soa(
+        case_id,
+        list(normalized_answers.keys()),
+        [payload.get("raw", "") for payload in payloads],
+        [payload.get("norm", "") for payload in payloads],
+    )
+
+
+def upsert_answers_soa(case_id: str, field_ids: List[str], raws: List[str], norms: List[str]) -> int:
+    if not (len(field_ids) == len(raws) == len(norms)):
+        raise ValueError("field_ids, raws and norms must have the same length")
+    if len(set(field_ids)) != len(field_ids):
+        raise ValueError("field_ids must be unique")
+
     now = utc_now()
-    rows: Iterable[tuple] = [
-        (case_id, field_id, payload.get("raw", ""), payload.get("norm", ""), now)
-        for field_id, payload in normalized_answers.items()
-    ]
+    rows: List[tuple] = list(zip(itertools.repeat(case_id), field_ids, raws, norms))
 
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
-            with conn.cursor() as cur:
-                cur.executemany(
-                    """
-                    INSERT INTO case_answers (case_id, field_id, answer_raw, answer_norm, updated_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT(case_id, field_id)
-                    DO UPDATE SET
-                        answer_raw = excluded.answer_raw,
-                        answer_norm = excluded.answer_norm,
-                        updated_at = excluded.updated_at
-                    """,
-                    rows,
-                )
+        with _pg_pool().connection() as conn:
+            # One explicit transaction for the answer batches and the case
+            # bump. Only the fixed full-size batch text is force-prepared; the
+            # variable-length tail is left to psycopg's prepare_threshold so
+            # it does not churn the per-connection prepared statement cache.
+            with conn.transaction(), conn.cursor() as cur:
+                for batch in _answer_batches(rows):
+                    cur.execute(
+                        _answer_upsert_sql("%s", len(batch)),
+                        [now, *itertools.chain.from_iterable(batch)],
+                        prepare=True if len(batch) == ANSWER_BATCH_SIZE else None,
+                    )
                 cur.execute("UPDATE cases SET updated_at = %s WHERE id = %s", (now, case_id))
-            conn.commit()
-            return len(normalized_answers)
-        finally:
-            conn.close()
-
-    conn = _connect_sqlite()
-    try:
-        conn.executemany(
-            """
-            INSERT INTO case_answers (case_id, field_id, answer_raw, answer_norm, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(case_id, field_id)
-            DO UPDATE SET
-                answer_raw = excluded.answer_raw,
-                answer_norm = excluded.answer_norm,
-                updated_at = excluded.updated_at
-            """,
-            rows,
-        )
+            return len(rows)
+
+    with _sqlite_write() as conn:
+        for batch in _answer_batches(rows):
+            conn.execute(
+                _answer_upsert_sql("?", len(batch)),
+                [now, *itertools.chain.from_iterable(batch)],
+            )
         conn.execute("UPDATE cases SET updated_at = ? WHERE id = ?", (now, case_id))
-        conn.commit()
-        return len(normalized_answers)
-    finally:
-        conn.close()
+    return len(rows)
 
 
 def get_answers(case_id: str, normalized: bool = False) -> Dict[str, str]:
     column = "answer_norm" if normalized else "answer_raw"
 
+    # Plain tuple rows: positional unpacking skips the per-row column-name
+    # lookups of dict_row / sqlite3.Row on this hot query.
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
-            with conn.cursor() as cur:
+        from psycopg.rows import tuple_row
+
+        with _pg_pool().connection() as conn:
+            with conn.cursor(row_factory=tuple_row) as cur:
                 cur.execute(
                     f"SELECT field_id, {column} AS value FROM case_answers WHERE case_id = %s",
                     (case_id,),
                 )
-                rows = cur.fetchall()
-            return {row["field_id"]: row["value"] or "" for row in rows}
-        finally:
-            conn.close()
+                return {field_id: value or "" for field_id, value in cur}
 
-    conn = _connect_sqlite()
-    try:
-        cur = conn.execute(
-            f"SELECT field_id, {column} AS value FROM case_answers WHERE case_id = ?",
-            (case_id,),
-        )
-        return {row["field_id"]: row["value"] or "" for row in cur.fetchall()}
-    finally:
-        conn.close()
+    cur = _get_conn().cursor()
+    cur.row_factory = None
+    cur.execute(
+        f"SELECT field_id, {column} AS value FROM case_answers WHERE case_id = ?",
+        (case_id,),
+    )
+    return {field_id: value or "" for field_id, value in cur}
+
+
+def get_normalized_answers(case_id: str) -> Dict[str, Dict[str, str]]:
+    if USE_POSTGRES:
+        from psycopg.rows import tuple_row
+
+        with _pg_pool().connection() as conn:
+            with conn.cursor(row_factory=tuple_row) as cur:
+                cur.execute(
+                    "SELECT field_id, answer_raw, answer_norm FROM case_answers WHERE case_id = %s",
+                    (case_id,),
+                )
+                return {field_id: {"raw": raw or "", "norm": norm or ""} for field_id, raw, norm in cur}
+
+    cur = _get_conn().cursor()
+    cur.row_factory = None
+    cur.execute(
+        "SELECT field_id, answer_raw, answer_norm FROM case_answers WHERE case_id = ?",
+        (case_id,),
+    )
+    return {field_id: {"raw": raw or "", "norm": norm or ""} for field_id, raw, norm in cur}
 
 
 def save_export(export_id: str, case_id: str, zip_path: str, checksum: str) -> Dict[str, str]:
     now = utc_now()
 
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
+        with _pg_pool().connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "INSERT INTO exports (id, case_id, zip_path, checksum, created_at) VALUES (%s, %s, %s, %s, %s)",
@@ -254,19 +341,13 @@ def save_export(export_id: str, case_id: str, zip_path: str, checksum: str) -> D
                 )
                 cur.execute("UPDATE cases SET status = 'exported', updated_at = %s WHERE id = %s", (now, case_id))
             conn.commit()
-        finally:
-            conn.close()
     else:
-        conn = _connect_sqlite()
-        try:
+        with _sqlite_write() as conn:
             conn.execute(
                 "INSERT INTO exports (id, case_id, zip_path, checksum, created_at) VALUES (?, ?, ?, ?, ?)",
                 (export_id, case_id, zip_path, checksum, now),
             )
             conn.execute("UPDATE cases SET status = 'exported', updated_at = ? WHERE id = ?", (now, case_id))
-            conn.commit()
-        finally:
-            conn.close()
 
     return {
         "id": export_id,
@@ -279,18 +360,12 @@ def save_export(export_id: str, case_id: str, zip_path: str, checksum: str) -> D
 
 def list_exports(case_id: str) -> List[Dict[str, str]]:
     if USE_POSTGRES:
-        conn = _connect_postgres()
-        try:
+        with _pg_pool().connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT * FROM exports WHERE case_id = %s ORDER BY created_at DESC", (case_id,))
                 rows = cur.fetchall()
             return [dict(r) for r in rows]
-        finally:
-            conn.close()
-
-    conn = _connect_sqlite()
-    try:
-        cur = conn.execute("SELECT * FROM exports WHERE case_id = ? ORDER BY created_at DESC", (case_id,))
-        return [dict(r) for r in cur.fetchall()]
-    finally:
-        conn.close()
+
+    conn = _get_conn()
+    cur = conn.execute("SELECT * FROM exports WHERE case_id = ? ORDER BY created_at DESC", (case_id,))
+    return [dict(r) for r in cur.fetchall()]
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import atexit
+import multiprocessing
+import os
+import re
 import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
@@ -12,6 +21,13 @@ from openpyxl.utils.cell import range_boundaries
 
 from .normalizer import to_excel_value
 
+# PyYAML wheels bundle the libyaml C bindings; source builds without libyaml
+# fall back to the pure-Python loader.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as YamlLoader
+
 
 @dataclass
 class WriteResult:
@@ -19,16 +35,39 @@ class WriteResult:
     mapping_notes: List[Dict[str, str]]
 
 
+TARGET_SEP_RE = re.compile(r"[;\n]+")
+
+# Many fields share the same cell_range, so reuse the parsed A1:B2 bounds.
+_range_boundaries = lru_cache(maxsize=4096)(range_boundaries)
+
+# Parsed mapping files keyed by path, reused while (mtime_ns, size) is unchanged.
+_MAPPING_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# Process pool for filling templates in parallel, created lazily by
+# _template_pool() and shared by every export.
+_TEMPLATE_POOL: Optional[ProcessPoolExecutor] = None
+_TEMPLATE_POOL_UNAVAILABLE = False
+_TEMPLATE_POOL_LOCK = threading.Lock()
+
+
 def load_mapping(mapping_path: Path) -> Dict[str, Any]:
     if not mapping_path.exists():
         raise FileNotFoundError(f"mapping file not found: {mapping_path}")
+    st = mapping_path.stat()
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _MAPPING_CACHE.get(str(mapping_path))
+    if cached and cached[0] == signature:
+        return cached[1]
+
     with mapping_path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=YamlLoader) or {}
     if "templates" not in data:
         data["templates"] = []
+    _MAPPING_CACHE[str(mapping_path)] = (signature, data)
     return data
 
 
+@lru_cache(maxsize=512)
 def infer_value_type(fmt: str) -> str:
     lowered = (fmt or "").lower()
     if "和暦" in fmt:
@@ -50,201 +89,304 @@ def _parse_target_segment(segment: str, default_sheet: Optional[str] = None) ->
     cleaned = (segment or "").strip()
     if not cleaned:
         return None
-    if "!" in cleaned:
-        sheet_name, cell_ref = cleaned.split("!", 1)
+    sheet_name, sep, cell_ref = cleaned.partition("!")
+    if sep:
         return sheet_name.strip(), cell_ref.strip()
     if default_sheet:
         return default_sheet, cleaned
     return None
 
 
-def parse_targets(cell_spec: str, default_sheet: Optional[str] = None) -> List[Tuple[str, str]]:
+# Cached per raw spec; returns a tuple so the shared result cannot be mutated.
+@lru_cache(maxsize=4096)
+def parse_targets(cell_spec: str, default_sheet: Optional[str] = None) -> Tuple[Tuple[str, str], ...]:
     if not cell_spec:
-        return []
-    segments = [seg.strip() for seg in cell_spec.replace("\n", ";").split(";")]
+        return ()
     targets: List[Tuple[str, str]] = []
-    for segment in segments:
+    for segment in TARGET_SEP_RE.split(cell_spec):
         parsed = _parse_target_segment(segment, default_sheet=default_sheet)
         if parsed:
             targets.append(parsed)
-    return targets
+    return tuple(targets)
 
 
 def _fill_linear_range(ws: Worksheet, cell_range: str, value: Any) -> None:
-    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    min_col, min_row, max_col, max_row = _range_boundaries(cell_range)
     if min_col == max_col and min_row == max_row:
         ws.cell(row=min_row, column=min_col, value=value)
         return
 
     text = "" if value is None else str(value)
-    chars = list(text)
-    idx = 0
-
-    if min_row == max_row:
-        for col in range(min_col, max_col + 1):
-            cell_value = chars[idx] if idx < len(chars) else ""
-            ws.cell(row=min_row, column=col, value=cell_value)
-            idx += 1
-        return
 
-    if min_col == max_col:
-        for row in range(min_row, max_row + 1):
-            cell_value = chars[idx] if idx < len(chars) else ""
-            ws.cell(row=row, column=min_col, value=cell_value)
-            idx += 1
-        return
-
-    # 2D range fallback: fill row-major with characters.
-    for row in range(min_row, max_row + 1):
-        for col in range(min_col, max_col + 1):
-            cell_value = chars[idx] if idx < len(chars) else ""
-            ws.cell(row=row, column=col, value=cell_value)
-            idx += 1
+    # Single-row, single-column and 2D ranges are all filled row-major,
+    # one character per cell. Cells past the end of the text keep their
+    # template contents.
+    coords = (
+        (row, col)
+        for row in range(min_row, max_row + 1)
+        for col in range(min_col, max_col + 1)
+    )
+    for (row, col), char in zip(coords, text):
+        ws.cell(row, col).value = char
 
 
 def _write_to_target(ws: Worksheet, target: str, value: Any) -> None:
     if ":" in target:
         _fill_linear_range(ws, target, value)
     else:
-        ws[target] = value
+        # Resolve the (cached) coordinates and write the cell directly instead
+        # of going through Worksheet.__setitem__'s A1 parsing on every call.
+        col, row, _, _ = _range_boundaries(target)
+        ws.cell(row, col).value = value
 
 
-def write_templates(
-    *,
+def _process_template(
+    template: Dict[str, Any],
     answers_norm: Dict[str, str],
     schema_lookup: Dict[str, Dict[str, Any]],
     template_dir: Path,
     output_dir: Path,
-    mapping_path: Path,
-) -> WriteResult:
-    mapping_data = load_mapping(mapping_path)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    output_files: List[Path] = []
+) -> Tuple[Optional[Path], List[Dict[str, str]]]:
     notes: List[Dict[str, str]] = []
 
-    for template in mapping_data.get("templates", []):
-        source_file = str(template.get("source_file", "")).strip()
-        output_file = str(template.get("output_file", "")).strip() or f"filled_{source_file}"
-        template_key = str(template.get("template_key", source_file)).strip()
-
-        source_path = template_dir / source_file
-        if not source_path.exists():
-            notes.append(
-                {
-                    "field_id": "*",
-                    "template": template_key,
-                    "level": "error",
-                    "message": f"テンプレートファイルが見つかりません: {source_path.name}",
-                }
-            )
+    source_file = str(template.get("source_file", "")).strip()
+    output_file = str(template.get("output_file", "")).strip() or f"filled_{source_file}"
+    template_key = str(template.get("template_key", source_file)).strip()
+
+    source_path = template_dir / source_file
+    if not source_path.exists():
+        notes.append(
+            {
+                "field_id": "*",
+                "template": template_key,
+                "level": "error",
+                "message": f"テンプレートファイルが見つかりません: {source_path.name}",
+            }
+        )
+        return None, notes
+
+    if source_path.suffix.lower() == ".xls":
+        notes.append(
+            {
+                "field_id": "*",
+                "template": template_key,
+                "level": "warning",
+                "message": ".xls は直接編集できないため未出力です。convert_xls.sh で .xlsx 化してください。",
+            }
+        )
+        return None, notes
+
+    # read_only/write_only workbooks cannot be edited in place and
+    # data_only would replace template formulas with cached values, so the
+    # regular loader is required. VBA and rich text are never written,
+    # so skip them. External links are kept so filled forms stay
+    # identical to the source apart from the answers.
+    workbook = load_workbook(
+        source_path,
+        read_only=False,
+        keep_vba=False,
+        data_only=False,
+        keep_links=True,
+        rich_text=False,
+    )
+    sheet_cache = {name: workbook[name] for name in workbook.sheetnames}
+
+    explicit_mappings: Dict[str, Dict[str, Any]] = template.get("mappings", {}) or {}
+    explicit_field_ids = set(explicit_mappings.keys())
+
+    source_form_files: Sequence[str] = template.get("source_form_files") or [source_file]
+    source_form_files = [str(x).strip() for x in source_form_files if str(x).strip()]
+
+    # Writes are planned per sheet first and applied together afterwards.
+    plan: Dict[str, List[Tuple[str, Any]]] = {}
+
+    # 1) explicit mappings
+    for field_id, conf in explicit_mappings.items():
+        answer = answers_norm.get(field_id, "")
+        if answer == "":
             continue
 
-        if source_path.suffix.lower() == ".xls":
+        sheet_name = str(conf.get("sheet", "")).strip()
+        cell_spec = str(conf.get("cell", "")).strip()
+        value_type = str(conf.get("type", "text")).strip()
+
+        targets = parse_targets(f"{sheet_name}!{cell_spec}" if sheet_name and "!" not in cell_spec else cell_spec)
+        if not targets:
             notes.append(
                 {
-                    "field_id": "*",
+                    "field_id": field_id,
                     "template": template_key,
                     "level": "warning",
-                    "message": ".xls は直接編集できないため未出力です。convert_xls.sh で .xlsx 化してください。",
+                    "message": "マッピング先セルが不正です。",
                 }
             )
             continue
 
-        workbook = load_workbook(source_path)
-
-        explicit_mappings: Dict[str, Dict[str, Any]] = template.get("mappings", {}) or {}
-        explicit_field_ids = set(explicit_mappings.keys())
-
-        source_form_files: Sequence[str] = template.get("source_form_files") or [source_file]
-        source_form_files = [str(x).strip() for x in source_form_files if str(x).strip()]
-
-        # 1) explicit mappings
-        for field_id, conf in explicit_mappings.items():
-            answer = answers_norm.get(field_id, "")
-            if answer == "":
-                continue
-
-            sheet_name = str(conf.get("sheet", "")).strip()
-            cell_spec = str(conf.get("cell", "")).strip()
-            value_type = str(conf.get("type", "text")).strip()
-
-            targets = parse_targets(f"{sheet_name}!{cell_spec}" if sheet_name and "!" not in cell_spec else cell_spec)
-            if not targets:
+        excel_value = to_excel_value(answer, value_type)
+        for target_sheet, target_cell in targets:
+            if target_sheet not in sheet_cache:
                 notes.append(
                     {
                         "field_id": field_id,
                         "template": template_key,
                         "level": "warning",
-                        "message": "マッピング先セルが不正です。",
+                        "message": f"シートが見つかりません: {target_sheet}",
                     }
                 )
                 continue
+            plan.setdefault(target_sheet, []).append((target_cell, excel_value))
 
-            excel_value = to_excel_value(answer, value_type)
-            for target_sheet, target_cell in targets:
-                if target_sheet not in workbook.sheetnames:
-                    notes.append(
-                        {
-                            "field_id": field_id,
-                            "template": template_key,
-                            "level": "warning",
-                            "message": f"シートが見つかりません: {target_sheet}",
-                        }
-                    )
-                    continue
-                ws = workbook[target_sheet]
-                _write_to_target(ws, target_cell, excel_value)
-
-        # 2) auto mapping from schema cell_range for remaining fields
-        for field_id, answer in answers_norm.items():
-            if answer == "" or field_id in explicit_field_ids:
-                continue
+    # 2) auto mapping from schema cell_range for remaining fields
+    for field_id, answer in answers_norm.items():
+        if answer == "" or field_id in explicit_field_ids:
+            continue
 
-            field = schema_lookup.get(field_id)
-            if not field:
-                continue
+        field = schema_lookup.get(field_id)
+        if not field:
+            continue
 
-            form_file = str(field.get("form_file", "")).strip()
-            if form_file not in source_form_files:
-                continue
+        form_file = str(field.get("form_file", "")).strip()
+        if form_file not in source_form_files:
+            continue
 
-            cell_range = str(field.get("cell_range", "")).strip()
-            if not cell_range:
-                continue
+        cell_range = str(field.get("cell_range", "")).strip()
+        if not cell_range:
+            continue
 
-            value_type = infer_value_type(str(field.get("format", "")))
-            excel_value = to_excel_value(answer, value_type)
+        value_type = infer_value_type(str(field.get("format", "")))
+        excel_value = to_excel_value(answer, value_type)
 
-            targets = parse_targets(cell_range)
-            if not targets:
+        targets = parse_targets(cell_range)
+        if not targets:
+            notes.append(
+                {
+                    "field_id": field_id,
+                    "template": template_key,
+                    "level": "warning",
+                    "message": f"cell_range の解析に失敗: {cell_range}",
+                }
+            )
+            continue
+
+        for target_sheet, target_cell in targets:
+            if target_sheet not in sheet_cache:
                 notes.append(
                     {
                         "field_id": field_id,
                         "template": template_key,
                         "level": "warning",
-                        "message": f"cell_range の解析に失敗: {cell_range}",
+                        "message": f"シートが見つかりません: {target_sheet}",
                     }
                 )
                 continue
+            plan.setdefault(target_sheet, []).append((target_cell, excel_value))
+
+    # 3) apply planned writes sheet by sheet, keeping mapping order per sheet
+    for target_sheet, writes in plan.items():
+        ws = sheet_cache[target_sheet]
+        for target_cell, excel_value in writes:
+            _write_to_target(ws, target_cell, excel_value)
+
+    out_path = output_dir / output_file
+    workbook.save(out_path)
+    return out_path, notes
+
+
+def _fillable_templates(templates: List[Dict[str, Any]], template_dir: Path) -> int:
+    # Only templates that will actually be loaded are worth a worker process.
+    fillable = 0
+    for template in templates:
+        source_path = template_dir / str(template.get("source_file", "")).strip()
+        if source_path.suffix.lower() != ".xls" and source_path.is_file():
+            fillable += 1
+    return fillable
+
+
+def _available_cpus() -> int:
+    # Honour CPU affinity (e.g. container cpusets) where the platform exposes it.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _template_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared worker pool, or None when processes are unavailable.
+
+    The pool is created once and kept for the life of the process so workers
+    keep their warm caches between exports. Workers are spawned rather than
+    forked because the server process is multi-threaded.
+    """
+    global _TEMPLATE_POOL, _TEMPLATE_POOL_UNAVAILABLE
+    with _TEMPLATE_POOL_LOCK:
+        if _TEMPLATE_POOL is None and not _TEMPLATE_POOL_UNAVAILABLE:
+            configured = os.getenv("EXCEL_FILLER_TEMPLATE_WORKERS")
+            workers = int(configured) if configured else _available_cpus()
+            if workers <= 1:
+                _TEMPLATE_POOL_UNAVAILABLE = True
+                return None
+            # Environments without working process pools (e.g. serverless
+            # runtimes lacking /dev/shm) fail here, at creation or when the
+            # first worker starts.
+            try:
+                pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                pool.submit(int).result()
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                _TEMPLATE_POOL_UNAVAILABLE = True
+                return None
+            _TEMPLATE_POOL = pool
+            atexit.register(pool.shutdown)
+        return _TEMPLATE_POOL
+
 
-            for target_sheet, target_cell in targets:
-                if target_sheet not in workbook.sheetnames:
-                    notes.append(
-                        {
-                            "field_id": field_id,
-                            "template": template_key,
-                            "level": "warning",
-                            "message": f"シートが見つかりません: {target_sheet}",
-                        }
-                    )
-                    continue
-                ws = workbook[target_sheet]
-                _write_to_target(ws, target_cell, excel_value)
-
-        out_path = output_dir / output_file
-        workbook.save(out_path)
-        output_files.append(out_path)
+def _discard_template_pool() -> None:
+    global _TEMPLATE_POOL
+    with _TEMPLATE_POOL_LOCK:
+        if _TEMPLATE_POOL is not None:
+            _TEMPLATE_POOL.shutdown(wait=False, cancel_futures=True)
+            _TEMPLATE_POOL = None
+
+
+def write_templates(
+    *,
+    answers_norm: Dict[str, str],
+    schema_lookup: Dict[str, Dict[str, Any]],
+    template_dir: Path,
+    output_dir: Path,
+    mapping_path: Path,
+) -> WriteResult:
+    mapping_data = load_mapping(mapping_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    templates = list(mapping_data.get("templates", []))
+    args = (
+        templates,
+        repeat(answers_norm),
+        repeat(schema_lookup),
+        repeat(template_dir),
+        repeat(output_dir),
+    )
+
+    # Templates are independent workbooks, so they can be filled in separate
+    # processes; without a pool they are filled one by one.
+    pool = _template_pool() if _fillable_templates(templates, template_dir) > 1 else None
+    if pool is not None:
+        try:
+            results = list(pool.map(_process_template, *args))
+        except BrokenProcessPool:
+            _discard_template_pool()
+            raise
+    else:
+        results = list(map(_process_template, *args))
+
+    output_files: List[Path] = []
+    notes: List[Dict[str, str]] = []
+    for out_path, template_notes in results:
+        if out_path is not None:
+            output_files.append(out_path)
+        notes.extend(template_notes)
 
     return WriteResult(output_files=output_files, mapping_notes=notes)
 
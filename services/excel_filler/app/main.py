@@ -1,23 +1,24 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import os
+import time
 import uuid
 import zipfile
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List
 
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 
 from .db import (
     create_case,
     get_answers,
     get_case,
+    get_normalized_answers,
     init_db,
     list_cases,
     list_exports,
@@ -26,8 +27,8 @@ from .db import (
 )
 from .excel_writer import create_review_report, write_templates
 from .normalizer import normalize_answers
-from .schema_loader import build_step_groups, get_field_lookup, get_fields
-from .validator import validate_answers
+from .schema_loader import get_field_lookup, get_fields, get_step_groups
+from .validator import build_field_rules, validate_answers
 
 APP_DIR = Path(__file__).resolve().parent
 SERVICE_DIR = APP_DIR.parent
@@ -39,9 +40,53 @@ elif os.getenv("VERCEL"):
 else:
     EXPORT_DIR = SERVICE_DIR / "exports"
 MAPPING_PATH = APP_DIR / "mapping.yml"
+# Deflate level for export bundles; level 1 is far cheaper than the default 6
+# and the bundles are small.
+ZIP_COMPRESSLEVEL = int(os.getenv("EXCEL_FILLER_ZIP_LEVEL", "1"))
+# Members that are already compressed are stored as-is. .xlsx is not listed:
+# openpyxl writes its parts with weak deflate and the filled forms still
+# shrink by roughly a quarter when re-deflated.
+ZIP_STORED_SUFFIXES = {".zip", ".png", ".jpg", ".jpeg", ".gif"}
+# Members below this size are read in one go and compressed as one buffer.
+ZIP_INLINE_MAX_BYTES = 1 << 20
 SCHEMA_PATH = APP_DIR / "schema.json"
 
 
+# Write-only wrapper that hashes everything written through it. It has no
+# tell/seek on purpose: zipfile then streams members sequentially (with data
+# descriptors) instead of seeking back to patch headers, so the running hash
+# matches the finished file.
+class HashingWriter:
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self._fileobj = fileobj
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+
+def _write_zip_member(zf: zipfile.ZipFile, file_path: Path) -> None:
+    compress_type = (
+        zipfile.ZIP_STORED if file_path.suffix.lower() in ZIP_STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+    )
+    if file_path.stat().st_size < ZIP_INLINE_MAX_BYTES:
+        # from_file keeps the mtime/mode that ZipFile.write would record; the
+        # level must be passed explicitly when writestr is given a ZipInfo.
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname=file_path.name)
+        zf.writestr(
+            zinfo,
+            file_path.read_bytes(),
+            compress_type=compress_type,
+            compresslevel=ZIP_COMPRESSLEVEL,
+        )
+    else:
+        zf.write(file_path, arcname=file_path.name, compress_type=compress_type)
+
+
 class CreateCaseRequest(BaseModel):
     title: str = "新規案件"
 
@@ -54,7 +99,11 @@ class ExportRequest(BaseModel):
     include_debug_json: bool = True
 
 
-app = FastAPI(title="Green Permit Intake Export API", version="0.1.0")
+app = FastAPI(
+    title="Green Permit Intake Export API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -69,17 +118,20 @@ app.add_middleware(
 def on_startup() -> None:
     init_db()
     EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    app.state.fields = get_fields(str(SCHEMA_PATH))
+    app.state.field_lookup = get_field_lookup(str(SCHEMA_PATH))
+    app.state.field_rules = build_field_rules(app.state.fields)
 
 
 @app.get("/health")
 def health() -> Dict[str, str]:
-    return {"status": "ok", "time": datetime.utcnow().isoformat()}
+    return {"status": "ok", "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
 
 
 @app.get("/schema")
 def schema() -> Dict[str, Any]:
-    fields = get_fields(str(SCHEMA_PATH))
-    steps = build_step_groups(fields)
+    fields = app.state.fields
+    steps = get_step_groups(str(SCHEMA_PATH))
     return {
         "field_count": len(fields),
         "steps": [
@@ -130,14 +182,15 @@ def update_answers_endpoint(case_id: str, payload: AnswersUpdateRequest) -> Dict
     if not case:
         raise HTTPException(status_code=404, detail="case not found")
 
-    field_lookup = get_field_lookup(str(SCHEMA_PATH))
+    field_lookup = app.state.field_lookup
     normalized = normalize_answers(payload.answers, field_lookup)
     updated = upsert_answers(case_id, normalized)
 
-    fields = get_fields(str(SCHEMA_PATH))
-    merged_raw = get_answers(case_id, normalized=False)
-    merged_obj = normalize_answers(merged_raw, field_lookup)
-    issues = validate_answers(fields, merged_obj)
+    # Every stored answer was normalized on write, so validate the merged
+    # state straight from the database instead of re-normalizing it.
+    fields = app.state.fields
+    merged_obj = get_normalized_answers(case_id)
+    issues = validate_answers(fields, merged_obj, app.state.field_rules)
 
     return {"updated": updated, "issues": issues}
 
@@ -148,11 +201,11 @@ def validate_case_endpoint(case_id: str) -> Dict[str, Any]:
     if not case:
         raise HTTPException(status_code=404, detail="case not found")
 
-    fields = get_fields(str(SCHEMA_PATH))
+    fields = app.state.fields
     raw_answers = get_answers(case_id, normalized=False)
-    field_lookup = get_field_lookup(str(SCHEMA_PATH))
+    field_lookup = app.state.field_lookup
     normalized = normalize_answers(raw_answers, field_lookup)
-    issues = validate_answers(fields, normalized)
+    issues = validate_answers(fields, normalized, app.state.field_rules)
 
     return {"issue_count": len(issues), "issues": issues}
 
@@ -163,15 +216,23 @@ def export_case_endpoint(case_id: str, payload: ExportRequest) -> FileResponse:
     if not case:
         raise HTTPException(status_code=404, detail="case not found")
 
-    fields = get_fields(str(SCHEMA_PATH))
-    field_lookup = get_field_lookup(str(SCHEMA_PATH))
-    raw_answers = get_answers(case_id, normalized=False)
+    fields = app.state.fields
+    field_lookup = app.state.field_lookup
+    stored = get_normalized_answers(case_id)
+    raw_answers = {field_id: payload["raw"] for field_id, payload in stored.items()}
     normalized = normalize_answers(raw_answers, field_lookup)
 
-    # Persist latest normalized answers before export.
-    upsert_answers(case_id, normalized)
+    # Persist latest normalized answers before export; only rows whose
+    # normalization changed since they were stored need rewriting.
+    stale = {
+        field_id: payload
+        for field_id, payload in normalized.items()
+        if payload["norm"] != stored[field_id]["norm"]
+    }
+    if stale:
+        upsert_answers(case_id, stale)
 
-    validation_issues = validate_answers(fields, normalized)
+    validation_issues = validate_answers(fields, normalized, app.state.field_rules)
     answers_norm = {field_id: payload["norm"] for field_id, payload in normalized.items()}
 
     export_id = str(uuid.uuid4())
@@ -194,8 +255,8 @@ def export_case_endpoint(case_id: str, payload: ExportRequest) -> FileResponse:
 
     if payload.include_debug_json:
         debug_path = export_work_dir / "debug_answers.json"
-        with debug_path.open("w", encoding="utf-8") as f:
-            json.dump(
+        debug_path.write_bytes(
+            orjson.dumps(
                 {
                     "case": case,
                     "answers_raw": raw_answers,
@@ -203,10 +264,9 @@ def export_case_endpoint(case_id: str, payload: ExportRequest) -> FileResponse:
                     "validation_issues": validation_issues,
                     "mapping_notes": write_result.mapping_notes,
                 },
-                f,
-                ensure_ascii=False,
-                indent=2,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
             )
+        )
 
     zip_path = EXPORT_DIR / case_id / f"export_{export_id}.zip"
     zip_path.parent.mkdir(parents=True, exist_ok=True)
@@ -221,12 +281,19 @@ def export_case_endpoint(case_id: str, payload: ExportRequest) -> FileResponse:
     if legacy_xls.exists() and not converted.exists():
         files_to_zip.append(legacy_xls)
 
-    with zipfile.ZipFile(zip_path, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for file_path in files_to_zip:
-            if file_path.exists():
-                zf.write(file_path, arcname=file_path.name)
-
-    checksum = hashlib.sha256(zip_path.read_bytes()).hexdigest()
+    with zip_path.open("wb") as zip_file:
+        writer = HashingWriter(zip_file)
+        with zipfile.ZipFile(
+            writer,
+            mode="w",
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=ZIP_COMPRESSLEVEL,
+        ) as zf:
+            for file_path in files_to_zip:
+                if file_path.exists():
+                    _write_zip_member(zf, file_path)
+
+    checksum = writer.hash.hexdigest()
     save_export(export_id, case_id, str(zip_path), checksum)
 
     return FileResponse(
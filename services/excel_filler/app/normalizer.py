@@ -1,19 +1,30 @@
 from __future__ import annotations
 
 import re
-from datetime import date, datetime
+from datetime import date
+from functools import lru_cache
 from typing import Any, Dict
 
-COMMA_RE = re.compile(r"[,，\s円¥]")
+# Deletes separators, currency marks and all Unicode whitespace (every
+# str.isspace() character lies below U+3001), matching the former [,，\s円¥].
+INT_STRIP_TABLE = str.maketrans(
+    "", "", ",，円¥" + "".join(chr(code) for code in range(0x3001) if chr(code).isspace())
+)
 WAREKI_RE = re.compile(r"令和\s*(\d+)\s*年\s*(\d+)\s*月\s*(\d+)\s*日")
 ISO_RE = re.compile(r"^(\d{4})[-/](\d{1,2})[-/](\d{1,2})$")
 
 
+def _is_int_text(text: str) -> bool:
+    # Same as re.fullmatch(r"-?\d+", text); \d and isdecimal() agree on Unicode.
+    digits = text[1:] if text.startswith("-") else text
+    return digits.isdecimal()
+
+
 def _to_int_like(value: str) -> str:
-    cleaned = COMMA_RE.sub("", value)
+    cleaned = value.translate(INT_STRIP_TABLE)
     if cleaned == "":
         return ""
-    if not re.fullmatch(r"-?\d+", cleaned):
+    if not _is_int_text(cleaned):
         return value
     return str(int(cleaned))
 
@@ -54,7 +65,11 @@ def normalize_value(raw_value: Any, fmt: str) -> str:
         raw = str(raw_value)
     else:
         raw = str(raw_value).strip()
+    return _normalize_text(raw, fmt)
+
 
+@lru_cache(maxsize=4096)
+def _normalize_text(raw: str, fmt: str) -> str:
     if raw == "":
         return ""
 
@@ -63,10 +78,21 @@ def normalize_value(raw_value: Any, fmt: str) -> str:
     if "yyyy" in fmt_lower or "日付" in fmt or "和暦" in fmt:
         if raw.startswith("令和"):
             return _wareki_to_iso(raw)
-        if ISO_RE.match(raw):
-            # Normalize zero padding.
-            dt = datetime.strptime(raw.replace("/", "-"), "%Y-%m-%d")
-            return dt.date().isoformat()
+        match = ISO_RE.match(raw)
+        if match:
+            # Already canonical ASCII YYYY-MM-DD: nothing to pad, and invalid
+            # dates are returned as entered anyway, so skip parsing entirely.
+            # ISO_RE's \d also matches full-width digits, which still need
+            # converting below.
+            if len(raw) == 10 and raw[4] == raw[7] == "-" and raw.isascii():
+                return raw
+            # Normalize zero padding; invalid dates are kept as entered.
+            y, m, d = map(int, match.groups())
+            try:
+                date(y, m, d)
+            except ValueError:
+                return raw
+            return f"{y:04d}-{m:02d}-{d:02d}"
         return raw
 
     if "金額" in fmt or "currency" in fmt_lower:
@@ -82,6 +108,7 @@ def normalize_value(raw_value: Any, fmt: str) -> str:
     return raw
 
 
+@lru_cache(maxsize=4096)
 def to_excel_value(norm_value: str, value_type: str) -> Any:
     if norm_value == "":
         return ""
@@ -91,7 +118,7 @@ def to_excel_value(norm_value: str, value_type: str) -> Any:
         return norm_value
     if value_type in {"number", "currency"}:
         int_like = _to_int_like(norm_value)
-        if re.fullmatch(r"-?\d+", int_like):
+        if _is_int_text(int_like):
             return int(int_like)
         return norm_value
     if value_type == "checkbox":
@@ -116,7 +143,7 @@ def normalize_answers(
         field = field_lookup.get(field_id, {})
         fmt = str(field.get("format", ""))
         raw = "" if raw_value is None else str(raw_value).strip()
-        norm = normalize_value(raw, fmt)
+        norm = _normalize_text(raw, fmt)
         normalized[field_id] = {"raw": raw, "norm": norm}
 
     return normalized
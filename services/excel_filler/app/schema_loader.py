@@ -23,13 +23,18 @@ def load_schema(schema_path: Optional[str] = None) -> Dict[str, Any]:
 
 def clear_schema_cache() -> None:
     load_schema.cache_clear()
+    get_fields.cache_clear()
+    get_field_lookup.cache_clear()
+    get_step_groups.cache_clear()
 
 
+@lru_cache(maxsize=4)
 def get_fields(schema_path: Optional[str] = None) -> List[Dict[str, Any]]:
     schema = load_schema(schema_path)
     return schema.get("fields", [])
 
 
+@lru_cache(maxsize=4)
 def get_field_lookup(schema_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
     lookup: Dict[str, Dict[str, Any]] = {}
     for field in get_fields(schema_path):
@@ -61,3 +66,8 @@ def build_step_groups(fields: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # while still returning full schema for expandability.
     grouped = [groups[key] for key in order]
     return grouped
+
+
+@lru_cache(maxsize=4)
+def get_step_groups(schema_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    return build_step_groups(get_fields(schema_path))
@@ -1,39 +1,98 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 from .normalizer import ISO_RE
 
 NUMERIC_RE = re.compile(r"^\d+$")
 PHONE_RE = re.compile(r"^\d{2,4}-?\d{2,4}-?\d{3,4}$")
 POSTAL_RE = re.compile(r"^\d{3}-?\d{4}$")
+DATE_VALUE_RE = re.compile(rf"{ISO_RE.pattern}|令和")
+
+# (format keywords, value check, message) applied to every non-empty answer.
+FORMAT_CHECKS: Tuple[Tuple[Pattern[str], Callable[[str], Any], str], ...] = (
+    (re.compile(r"数字|number", re.IGNORECASE), NUMERIC_RE.fullmatch, "数字形式が期待されます。"),
+    (
+        re.compile(r"電話|0xx", re.IGNORECASE),
+        PHONE_RE.fullmatch,
+        "電話番号の形式を確認してください（例: 019-1234-5678）。",
+    ),
+    (re.compile(r"郵便|〒"), POSTAL_RE.search, "郵便番号形式を確認してください（例: 123-4567）。"),
+    (
+        re.compile(r"yyyy|日付|和暦", re.IGNORECASE),
+        DATE_VALUE_RE.match,
+        "日付形式が不正です（YYYY-MM-DD または 令和X年Y月Z日）。",
+    ),
+)
 
 UNKNOWN_MARKERS = {"不明", "要確認", "対象外", "unknown", "todo"}
 
 
+@lru_cache(maxsize=4096)
+def _count_field_kind(field_id: str) -> Tuple[bool, bool]:
+    # (vehicle count, driver count) by Field_ID naming convention. Answers may
+    # carry ids outside the schema, so this is cached per id rather than
+    # precomputed from the schema.
+    upper = field_id.upper()
+    is_vehicle = "VEHICLE" in upper or "CAR" in upper or "車両" in upper
+    is_driver = "DRIVER" in upper or "運転者" in upper
+    return is_vehicle, is_driver
+
+
 def _required_flag(required: Any) -> bool:
     text = str(required).strip().lower()
     return text in {"true", "1", "yes", "必須", "required"} or "必須" in str(required)
 
 
-def validate_answers(
-    fields: List[Dict[str, Any]],
-    normalized_answers: Dict[str, Dict[str, str]],
-) -> List[Dict[str, Any]]:
-    issues: List[Dict[str, Any]] = []
+@dataclass(frozen=True)
+class FieldRule:
+    field_id: str
+    required: bool
+    checks: Tuple[Tuple[Callable[[str], Any], str], ...]
 
+
+def build_field_rules(fields: List[Dict[str, Any]]) -> List[FieldRule]:
+    # Everything here depends only on the schema, so it can be built once per
+    # process and reused for every validate call.
+    rules: List[FieldRule] = []
     for field in fields:
         field_id = str(field.get("field_id", "")).strip()
         if not field_id:
             continue
+        fmt = str(field.get("format", ""))
+        rules.append(
+            FieldRule(
+                field_id=field_id,
+                required=_required_flag(field.get("required")),
+                checks=tuple(
+                    (check, message)
+                    for category_re, check, message in FORMAT_CHECKS
+                    if category_re.search(fmt)
+                ),
+            )
+        )
+    return rules
 
+
+def validate_answers(
+    fields: List[Dict[str, Any]],
+    normalized_answers: Dict[str, Dict[str, str]],
+    rules: Optional[List[FieldRule]] = None,
+) -> List[Dict[str, Any]]:
+    issues: List[Dict[str, Any]] = []
+    if rules is None:
+        rules = build_field_rules(fields)
+
+    for rule in rules:
+        field_id = rule.field_id
         answer_obj = normalized_answers.get(field_id, {"raw": "", "norm": ""})
         raw = answer_obj.get("raw", "").strip()
         norm = answer_obj.get("norm", "").strip()
-        fmt = str(field.get("format", ""))
 
-        if _required_flag(field.get("required")):
+        if rule.required:
             if raw == "":
                 issues.append(
                     {
@@ -54,55 +113,29 @@ def validate_answers(
         if norm == "":
             continue
 
-        if ("数字" in fmt or "number" in fmt.lower()) and not NUMERIC_RE.fullmatch(norm):
-            issues.append(
-                {
-                    "field_id": field_id,
-                    "severity": "warning",
-                    "message": "数字形式が期待されます。",
-                }
-            )
-
-        if ("電話" in fmt or "0xx" in fmt.lower()) and not PHONE_RE.fullmatch(norm):
-            issues.append(
-                {
-                    "field_id": field_id,
-                    "severity": "warning",
-                    "message": "電話番号の形式を確認してください（例: 019-1234-5678）。",
-                }
-            )
-
-        if ("郵便" in fmt or "〒" in fmt or "郵便番号" in fmt) and not POSTAL_RE.search(norm):
-            issues.append(
-                {
-                    "field_id": field_id,
-                    "severity": "warning",
-                    "message": "郵便番号形式を確認してください（例: 123-4567）。",
-                }
-            )
-
-        if ("yyyy" in fmt.lower() or "日付" in fmt or "和暦" in fmt) and not (
-            ISO_RE.match(norm) or norm.startswith("令和")
-        ):
-            issues.append(
-                {
-                    "field_id": field_id,
-                    "severity": "warning",
-                    "message": "日付形式が不正です（YYYY-MM-DD または 令和X年Y月Z日）。",
-                }
-            )
+        for check, message in rule.checks:
+            if not check(norm):
+                issues.append(
+                    {
+                        "field_id": field_id,
+                        "severity": "warning",
+                        "message": message,
+                    }
+                )
 
     # Lightweight cross-checks by Field_ID naming convention.
     vehicle_count = None
     driver_count = None
     for field_id, answer in normalized_answers.items():
+        is_vehicle, is_driver = _count_field_kind(field_id)
+        if not (is_vehicle or is_driver):
+            continue
         value = answer.get("norm", "")
         if not value.isdigit():
             continue
-        upper = field_id.upper()
-        if "VEHICLE" in upper or "CAR" in upper or "車両" in upper:
+        if is_vehicle:
             vehicle_count = int(value)
-        if "DRIVER" in upper or "運転者" in upper:
+        if is_driver:
             driver_count = int(value)
 
     if vehicle_count is not None and driver_count is not None and driver_count < vehicle_count:
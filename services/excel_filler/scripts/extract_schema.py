@@ -2,22 +2,47 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
 import re
-import xml.etree.ElementTree as ET
+import string
 import zipfile
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from lxml import etree as ET  # C parser, noticeably faster on large sheets
+except ImportError:  # pragma: no cover
+    import xml.etree.ElementTree as ET
+
 MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
 PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
 NS = {"a": MAIN_NS, "r": REL_NS, "p": PKG_REL_NS}
 
+# Clark-notation tags for the hot row/cell traversal, so lookups skip prefix
+# resolution against NS on every call.
+ROW_TAG = f"{{{MAIN_NS}}}row"
+C_TAG = f"{{{MAIN_NS}}}c"
+V_TAG = f"{{{MAIN_NS}}}v"
+IS_TAG = f"{{{MAIN_NS}}}is"
+T_TAG = f"{{{MAIN_NS}}}t"
+SI_TAG = f"{{{MAIN_NS}}}si"
+
 CELL_REF_RE = re.compile(r"^([A-Z]+)(\d+)$")
 
 
+# A..Z, AA..ZZ, AAA..ZZZ in column order, so the index is the insertion position.
+COL_INDEX: Dict[str, int] = {}
+for _width in (1, 2, 3):
+    for _letters in itertools.product(string.ascii_uppercase, repeat=_width):
+        COL_INDEX["".join(_letters)] = len(COL_INDEX) + 1
+
+
 def col_to_index(col_letters: str) -> int:
+    index = COL_INDEX.get(col_letters)
+    if index is not None:
+        return index
     value = 0
     for ch in col_letters:
         value = value * 26 + (ord(ch) - ord("A") + 1)
@@ -29,8 +54,8 @@ def parse_shared_strings(zf: zipfile.ZipFile) -> List[str]:
         return []
     root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
     strings: List[str] = []
-    for si in root.findall("a:si", NS):
-        text = "".join(t.text or "" for t in si.findall(".//a:t", NS))
+    for si in root.iterfind(SI_TAG):
+        text = "".join(t.text or "" for t in si.iter(T_TAG))
         strings.append(text)
     return strings
 
@@ -65,12 +90,12 @@ def parse_cell_value(cell: ET.Element, shared_strings: List[str]) -> str:
     cell_type = cell.attrib.get("t")
 
     if cell_type == "inlineStr":
-        inline = cell.find("a:is", NS)
+        inline = cell.find(IS_TAG)
         if inline is None:
             return ""
-        return "".join(t.text or "" for t in inline.findall(".//a:t", NS))
+        return "".join(t.text or "" for t in inline.iter(T_TAG))
 
-    v = cell.find("a:v", NS)
+    v = cell.find(V_TAG)
     if v is None:
         return ""
 
@@ -85,25 +110,31 @@ def parse_cell_value(cell: ET.Element, shared_strings: List[str]) -> str:
     return raw
 
 
-def parse_rows(zf: zipfile.ZipFile, sheet_path: str) -> List[Dict[int, str]]:
-    root = ET.fromstring(zf.read(sheet_path))
-    sheet_data = root.find("a:sheetData", NS)
-    if sheet_data is None:
-        return []
+def parse_rows(
+    zf: zipfile.ZipFile,
+    sheet_path: str,
+    shared_strings: Optional[List[str]] = None,
+) -> List[Dict[int, str]]:
+    if shared_strings is None:
+        shared_strings = parse_shared_strings(zf)
 
-    shared_strings = parse_shared_strings(zf)
     rows: List[Dict[int, str]] = []
 
-    for row in sheet_data.findall("a:row", NS):
-        row_values: Dict[int, str] = {}
-        for cell in row.findall("a:c", NS):
-            ref = cell.attrib.get("r", "")
-            m = CELL_REF_RE.match(ref)
-            if not m:
+    # Stream <row> elements instead of building the whole sheet DOM.
+    with zf.open(sheet_path) as f:
+        for _, row in ET.iterparse(f, events=("end",)):
+            if row.tag != ROW_TAG:
                 continue
-            col_idx = col_to_index(m.group(1))
-            row_values[col_idx] = parse_cell_value(cell, shared_strings)
-        rows.append(row_values)
+            row_values: Dict[int, str] = {}
+            for cell in row.iterfind(C_TAG):
+                ref = cell.attrib.get("r", "")
+                m = CELL_REF_RE.match(ref)
+                if not m:
+                    continue
+                col_idx = col_to_index(m.group(1))
+                row_values[col_idx] = parse_cell_value(cell, shared_strings)
+            rows.append(row_values)
+            row.clear()
 
     return rows
 
@@ -175,7 +206,8 @@ def build_fields(records: List[Dict[str, str]]) -> List[Dict[str, object]]:
 def extract_schema(src: Path, sheet_name: str, out: Path) -> int:
     with zipfile.ZipFile(src) as zf:
         sheet_path = get_sheet_path(zf, sheet_name)
-        rows = parse_rows(zf, sheet_path)
+        shared_strings = parse_shared_strings(zf)
+        rows = parse_rows(zf, sheet_path, shared_strings)
 
     if not rows:
         raise ValueError("sheet has no rows")
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app import db
+
+
+@pytest.fixture()
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "USE_POSTGRES", False)
+    monkeypatch.setattr(db, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "app.db")
+    monkeypatch.setattr(db, "_LOCAL", threading.local())
+    db.init_db()
+    return db
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app import db
+
+
+def _answers(value: str, count: int) -> dict:
+    return {f"f{i:03d}": {"raw": value, "norm": value} for i in range(count)}
+
+
+def test_concurrent_reader_never_sees_partial_upsert(sqlite_db) -> None:
+    field_count = db.ANSWER_BATCH_SIZE + 100
+    db.create_case("case-1", "t")
+    db.upsert_answers("case-1", _answers("a", field_count))
+
+    done = threading.Event()
+    partial = []
+
+    def writer() -> None:
+        try:
+            for i in range(30):
+                db.upsert_answers("case-1", _answers("ab"[i % 2], field_count))
+        finally:
+            done.set()
+
+    def reader() -> None:
+        while not done.is_set():
+            values = set(db.get_answers("case-1").values())
+            if len(values) != 1:
+                partial.append(values)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not partial
+
+
+def test_sqlite_write_rolls_back_on_error(sqlite_db) -> None:
+    db.create_case("case-1", "t")
+
+    with pytest.raises(RuntimeError):
+        with db._sqlite_write() as conn:
+            conn.execute("UPDATE cases SET title = 'changed' WHERE id = 'case-1'")
+            raise RuntimeError("boom")
+
+    assert not db._get_conn().in_transaction
+    assert db.get_case("case-1")["title"] == "t"
+
+
+def test_sqlite_write_rolls_back_when_commit_fails(sqlite_db) -> None:
+    with pytest.raises(Exception, match="FOREIGN KEY"):
+        with db._sqlite_write() as conn:
+            conn.execute("PRAGMA defer_foreign_keys = ON")
+            conn.execute(
+                "INSERT INTO case_answers (case_id, field_id, answer_raw, answer_norm, updated_at) "
+                "VALUES ('missing', 'f1', 'x', 'x', 'now')"
+            )
+
+    assert not db._get_conn().in_transaction
+    db.create_case("case-2", "t")
+    assert db.get_answers("missing") == {}
+
+
+def test_upsert_answers_soa_rejects_duplicate_field_ids(sqlite_db) -> None:
+    db.create_case("case-1", "t")
+
+    with pytest.raises(ValueError, match="unique"):
+        db.upsert_answers_soa("case-1", ["f1", "f1"], ["a", "b"], ["a", "b"])
+
+    assert db.get_answers("case-1") == {}
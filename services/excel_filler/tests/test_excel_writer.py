@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from app import excel_writer
+from app.schema_loader import get_field_lookup
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+TEMPLATE = SERVICE_DIR / "templates" / "001388353.xlsx"
+MAPPING_PATH = SERVICE_DIR / "app" / "mapping.yml"
+
+
+@pytest.fixture()
+def template_dir(tmp_path) -> Path:
+    # The mapping lists two .xlsx templates; only one ships with the repo,
+    # so reuse it for the converted form to get two fillable templates.
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    shutil.copy(TEMPLATE, template_dir / "001388353.xlsx")
+    shutil.copy(TEMPLATE, template_dir / "001388356_converted.xlsx")
+    return template_dir
+
+
+def _write(template_dir: Path, output_dir: Path) -> dict:
+    result = excel_writer.write_templates(
+        answers_norm={"APP0005": "岩手県", "APP0008": "山田", "RATE0003": "運賃"},
+        schema_lookup=get_field_lookup(),
+        template_dir=template_dir,
+        output_dir=output_dir,
+        mapping_path=MAPPING_PATH,
+    )
+    cells = {}
+    for path in result.output_files:
+        for ws in load_workbook(path).worksheets:
+            for row in ws.iter_rows():
+                for cell in row:
+                    if cell.value is not None:
+                        cells[(path.name, ws.title, cell.coordinate)] = cell.value
+    return {"cells": cells, "notes": result.mapping_notes}
+
+
+def test_template_pool_matches_serial(template_dir, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(excel_writer, "_TEMPLATE_POOL", None)
+    monkeypatch.setattr(excel_writer, "_TEMPLATE_POOL_UNAVAILABLE", False)
+
+    monkeypatch.setenv("EXCEL_FILLER_TEMPLATE_WORKERS", "1")
+    serial = _write(template_dir, tmp_path / "serial")
+    assert excel_writer._TEMPLATE_POOL is None
+
+    monkeypatch.setattr(excel_writer, "_TEMPLATE_POOL_UNAVAILABLE", False)
+    monkeypatch.setenv("EXCEL_FILLER_TEMPLATE_WORKERS", "2")
+    try:
+        pooled = _write(template_dir, tmp_path / "pooled")
+        assert excel_writer._TEMPLATE_POOL is not None
+    finally:
+        excel_writer._discard_template_pool()
+
+    # Both templates were written: answers land in the first, and the second
+    # reports its missing sheets as mapping notes.
+    assert {name for name, _, _ in serial["cells"]} == {"filled_001388353.xlsx", "filled_001388356.xlsx"}
+    assert "岩手県" in serial["cells"].values()
+    assert [note["template"] for note in serial["notes"]] == ["unchin_todoke"]
+    assert pooled == serial
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import HashingWriter, _write_zip_member
+
+
+@pytest.fixture()
+def client(sqlite_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "EXPORT_DIR", tmp_path / "exports")
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_hashing_writer_matches_zip_bytes(tmp_path) -> None:
+    small = tmp_path / "small.txt"
+    small.write_bytes(b"abc" * 1000)
+    large = tmp_path / "large.bin"
+    large.write_bytes(os.urandom(main.ZIP_INLINE_MAX_BYTES + 1))
+
+    buffer = io.BytesIO()
+    writer = HashingWriter(buffer)
+    with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        _write_zip_member(zf, small)
+        _write_zip_member(zf, large)
+
+    data = buffer.getvalue()
+    assert writer.hash.hexdigest() == hashlib.sha256(data).hexdigest()
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert zf.read("small.txt") == small.read_bytes()
+        assert zf.read("large.bin") == large.read_bytes()
+
+
+def test_export_checksum_matches_zip(client) -> None:
+    case_id = client.post("/cases", json={"title": "t"}).json()["case"]["id"]
+    client.put(f"/cases/{case_id}/answers", json={"answers": {"APP0005": "岩手県", "APP0008": "山田"}})
+
+    response = client.post(f"/exports/{case_id}", json={"include_debug_json": True})
+    assert response.status_code == 200
+
+    export = client.get(f"/cases/{case_id}").json()["exports"][0]
+    with open(export["zip_path"], "rb") as f:
+        data = f.read()
+    assert data == response.content
+    assert export["checksum"] == hashlib.sha256(data).hexdigest()
+
+
+def test_export_rewrites_only_changed_answers(client, sqlite_db) -> None:
+    case_id = client.post("/cases", json={"title": "t"}).json()["case"]["id"]
+    # RATE0002 is a date field stored with a stale normalization; APP0005 is
+    # already normalized and must be left untouched.
+    sqlite_db.upsert_answers(
+        case_id,
+        {
+            "RATE0002": {"raw": "2024/1/5", "norm": "2024/1/5"},
+            "APP0005": {"raw": "岩手県", "norm": "岩手県"},
+        },
+    )
+
+    def stored_rows():
+        cur = sqlite_db._get_conn().execute(
+            "SELECT field_id, answer_norm, updated_at FROM case_answers WHERE case_id = ?",
+            (case_id,),
+        )
+        return {row["field_id"]: (row["answer_norm"], row["updated_at"]) for row in cur}
+
+    before = stored_rows()
+    response = client.post(f"/exports/{case_id}", json={"include_debug_json": False})
+    assert response.status_code == 200
+
+    after = stored_rows()
+    assert after["RATE0002"][0] == "2024-01-05"
+    assert after["APP0005"] == before["APP0005"]
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert "filled_001388353.xlsx" in zf.namelist()
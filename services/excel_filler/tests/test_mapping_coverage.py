@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import warnings
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
@@ -11,14 +12,16 @@ SCHEMA_PATH = BASE_DIR / "app" / "schema.json"
 MAPPING_PATH = BASE_DIR / "app" / "mapping.yml"
 
 
+@lru_cache(maxsize=1)
 def _load_schema() -> dict:
     with SCHEMA_PATH.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
+@lru_cache(maxsize=1)
 def _load_mapping() -> dict:
     with MAPPING_PATH.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
 
 def test_schema_has_fields() -> None:
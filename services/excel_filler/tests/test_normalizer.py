@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pytest
+
+from app.normalizer import normalize_value
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("2024-01-05", "2024-01-05"),
+        ("2024-1-5", "2024-01-05"),
+        ("2024/1/5", "2024-01-05"),
+        ("２０２４-０１-０５", "2024-01-05"),
+        ("２０２４/０１/０５", "2024-01-05"),
+        ("２０２４-１-５", "2024-01-05"),
+        ("令和6年1月5日", "2024-01-05"),
+        ("2024-13-40", "2024-13-40"),
+        ("2024/2/30", "2024/2/30"),
+    ],
+)
+def test_normalize_date(raw: str, expected: str) -> None:
+    assert normalize_value(raw, "yyyy-mm-dd") == expected